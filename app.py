@@ -1,8 +1,27 @@
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import plotly.express as px
+
+from mortgage_engine import Loan
+from mortgage_engine.scenarios import rate_range, sensitivity_grid
+from ui_helpers import (
+    apply_inputs,
+    cached_schedule,
+    currency_column_config,
+    input_group,
+    record_timing,
+    render_cache_debug,
+    render_explore_mode,
+    render_loan_schedule,
+    render_store_browser,
+    render_timing_debug,
+    schedule_download_button,
+    timed_fragment
+)
+
+script_started = time.perf_counter()
 
 # Set page configuration
 st.set_page_config(
@@ -18,187 +37,225 @@ st.markdown("Use this calculator to estimate your monthly mortgage payments and
 # Sidebar with inputs
 st.sidebar.header("Mortgage Inputs")
 
-loan_amount = st.sidebar.number_input(
+apply_mode = st.sidebar.toggle(
+    "Apply changes with a button",
+    help="Edit several inputs and recalculate once, instead of after every change"
+)
+inputs = input_group("mortgage-inputs", apply_mode, st.sidebar)
+
+loan_amount = inputs.number_input(
     "Loan Amount ($)",
     min_value=10000,
     max_value=10000000,
     value=300000,
-    step=10000
+    step=10000,
+    key="loan_amount"
 )
 
-interest_rate = st.sidebar.number_input(
+interest_rate = inputs.number_input(
     "Annual Interest Rate (%)",
     min_value=0.1,
     max_value=20.0,
     value=4.5,
-    step=0.1
+    step=0.1,
+    key="interest_rate"
 )
 
-loan_term = st.sidebar.number_input(
+loan_term = inputs.number_input(
     "Loan Term (Years)",
     min_value=1,
     max_value=40,
     value=30,
-    step=1
+    step=1,
+    key="loan_term"
 )
 
-# Calculate mortgage details
-monthly_interest_rate = interest_rate / 100 / 12
-total_payments = loan_term * 12
-monthly_payment = loan_amount * (monthly_interest_rate * (1 + monthly_interest_rate) ** total_payments) / ((1 + monthly_interest_rate) ** total_payments - 1)
+apply_inputs(inputs, "mortgage-inputs", apply_mode, (loan_amount, interest_rate, loan_term))
 
-# Display calculated values
-col1, col2, col3 = st.columns(3)
-col1.metric("Monthly Payment", f"${monthly_payment:.2f}")
-col2.metric("Total Payment", f"${monthly_payment * total_payments:.2f}")
-col3.metric("Total Interest", f"${(monthly_payment * total_payments) - loan_amount:.2f}")
+explore_mode = st.sidebar.toggle(
+    "Explore mode",
+    help="Sweep the loan amount and rate around these inputs with instant updates"
+)
 
-# Create amortization schedule
-def create_amortization_schedule(loan_amount, interest_rate, loan_term):
-    monthly_rate = interest_rate / 100 / 12
-    total_payments = loan_term * 12
-    
-    schedule = []
-    remaining_balance = loan_amount
-    
-    for payment_no in range(1, total_payments + 1):
-        interest_payment = remaining_balance * monthly_rate
-        principal_payment = monthly_payment - interest_payment
-        remaining_balance -= principal_payment
-        
-        # Ensure balance doesn't go negative due to rounding
-        if remaining_balance < 0:
-            remaining_balance = 0
-            
-        schedule.append({
-            'Payment': payment_no,
-            'Payment Amount': monthly_payment,
-            'Principal': principal_payment,
-            'Interest': interest_payment,
-            'Remaining Balance': remaining_balance
-        })
-    
-    return pd.DataFrame(schedule)
+# Calculate mortgage details
+@timed_fragment("Metrics")
+def render_metrics(loan):
+    # Display calculated values
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Monthly Payment", f"${loan.payment:.2f}")
+    col2.metric("Total Payment", f"${loan.payment * loan.total_payments:.2f}")
+    col3.metric("Total Interest", f"${loan.total_interest:.2f}")
 
-# Generate amortization schedule
-amortization_df = create_amortization_schedule(loan_amount, interest_rate, loan_term)
+render_metrics(Loan(loan_amount, interest_rate, loan_term))
 
-# Visualization section
-st.header("Mortgage Visualization")
+if explore_mode:
+    st.header("Explore")
+    render_explore_mode(loan_amount, interest_rate, loan_term)
 
-# Create tabs for different visualizations
-tab1, tab2, tab3 = st.tabs(["Balance Over Time", "Payment Breakdown", "Amortization Schedule"])
+# Create amortization schedule
+SCHEDULE_COLUMNS = (
+    ('Month', 'Payment'),
+    ('Payment', 'Payment Amount'),
+    ('Principal', 'Principal'),
+    ('Interest', 'Interest'),
+    ('Remaining Balance', 'Remaining Balance')
+)
 
-with tab1:
-    # Balance over time visualization
-    st.subheader("Loan Balance Over Time")
+@timed_fragment("Table")
+def render_schedule_table(loan_amount, interest_rate, loan_term):
+    schedule = cached_schedule(loan_amount, interest_rate, loan_term)
+    annual = schedule.annual
     
-    # Simplify the approach - use the full dataset but sample points for clearer visualization
-    # Take initial point (0), yearly points, and final point
-    yearly_points = [0] + [i*12 for i in range(1, loan_term+1) if i*12 < len(amortization_df)]
-    if len(amortization_df)-1 not in yearly_points:
-        yearly_points.append(len(amortization_df)-1)
+    # Show the amortization table one year at a time
+    st.subheader("Amortization Schedule")
+    exact = render_loan_schedule(loan_amount, interest_rate, loan_term, SCHEDULE_COLUMNS)
     
-    yearly_data = amortization_df.iloc[yearly_points].copy()
-    
-    # Scale values to make the chart clearer (showing in thousands)
-    yearly_data['Remaining Balance (Thousands)'] = yearly_data['Remaining Balance'] / 1000
-    
-    balance_fig = px.line(
-        yearly_data, 
-        x='Payment', 
-        y='Remaining Balance (Thousands)',
-        title="Remaining Loan Balance Over Time",
-        labels={"Payment": "Payment Number (Month)", "Remaining Balance (Thousands)": "Remaining Balance ($, thousands)"}
-    )
+    st.markdown("*Note: Full amortization schedule also available for download*")
     
-    # Improve the styling
-    balance_fig.update_traces(line=dict(width=3))
-    balance_fig.update_layout(
-        xaxis=dict(showgrid=True),
-        yaxis=dict(showgrid=True)
+    # Yearly totals straight from the engine's annual summary
+    st.subheader("Annual Summary")
+    st.dataframe(
+        pd.DataFrame(annual.columns()),
+        hide_index=True,
+        column_config=currency_column_config(
+            ('Interest', 'Principal', 'Ending Balance', 'Cumulative Interest', 'Cumulative Principal')
+        )
     )
+
+    # Download option, inside this fragment so it follows the exact-cents toggle
+    schedule_download_button(loan_amount, interest_rate, loan_term, SCHEDULE_COLUMNS, exact)
+
+@timed_fragment("Charts")
+def render_visualizations(loan_amount, interest_rate, loan_term):
+    # Generate amortization schedule and its yearly totals (built once, in one pass)
+    loan = Loan(loan_amount, interest_rate, loan_term)
+    annual = cached_schedule(loan_amount, interest_rate, loan_term).annual
     
-    st.plotly_chart(balance_fig)
-    
-    # Principal vs Interest over time
-    st.subheader("Principal vs Interest Payments")
-    # Show yearly data for this chart as well
-    interest_yearly = amortization_df.groupby(amortization_df.index // 12)[['Interest']].sum().reset_index()
-    interest_yearly['Payment'] = (interest_yearly['index'] + 1) * 12
-    interest_yearly = interest_yearly.drop('index', axis=1)
-    
-    principal_yearly = amortization_df.groupby(amortization_df.index // 12)[['Principal']].sum().reset_index()
-    principal_yearly['Payment'] = (principal_yearly['index'] + 1) * 12
-    principal_yearly = principal_yearly.drop('index', axis=1)
-    
-    interest_data = pd.DataFrame({
-        'Payment': interest_yearly['Payment'],
-        'Payment Type': 'Interest',
-        'Amount': interest_yearly['Interest']
-    })
-    
-    principal_data = pd.DataFrame({
-        'Payment': principal_yearly['Payment'],
-        'Payment Type': 'Principal',
-        'Amount': principal_yearly['Principal']
-    })
-    
-    payment_data = pd.concat([interest_data, principal_data])
-    
-    payment_fig = px.line(
-        payment_data, 
-        x='Payment', 
-        y='Amount', 
-        color='Payment Type',
-        title="Principal vs Interest Payments Over Time (Yearly)",
-        labels={"Payment": "Payment (Month)", "Amount": "Amount ($)"}
-    )
-    st.plotly_chart(payment_fig)
-
-with tab2:
-    # Payment breakdown pie chart
-    total_interest = (monthly_payment * total_payments) - loan_amount
-    data = pd.DataFrame({
-        'Category': ['Principal', 'Interest'],
-        'Amount': [loan_amount, total_interest]
-    })
-    
-    fig = px.pie(
-        data, 
-        values='Amount', 
-        names='Category',
-        title="Principal vs Interest",
-        color_discrete_sequence=px.colors.qualitative.Set2
-    )
-    st.plotly_chart(fig)
-
-with tab3:
-    # Show amortization table (first 12 rows)
-    st.subheader("Amortization Schedule (First Year)")
-    st.dataframe(amortization_df.head(12).style.format({
-        'Payment Amount': '${:.2f}',
-        'Principal': '${:.2f}',
-        'Interest': '${:.2f}',
-        'Remaining Balance': '${:.2f}'
-    }))
-    
-    st.markdown("*Note: Full amortization schedule available upon download*")
-    
-    # Download option
-    @st.cache_data
-    def convert_df_to_csv(df):
-        return df.to_csv().encode('utf-8')
-    
-    csv = convert_df_to_csv(amortization_df)
-    st.download_button(
-        "Download Full Amortization Schedule",
-        csv,
-        "mortgage_amortization.csv",
-        "text/csv",
-        key='download-csv'
+    # Create tabs for different visualizations
+    # Switching tabs reruns only this fragment, and only the selected tab's body runs.
+    # plotly.express is imported inside the three chart tabs, so opening the
+    # schedule tab does not pay for it.
+    tab1, tab2, tab_sensitivity, tab3 = st.tabs(
+        ["Balance Over Time", "Payment Breakdown", "Rate & Term Sensitivity", "Amortization Schedule"],
+        key="visualization-tab",
+        on_change="rerun"
     )
 
+    with tab1:
+        if tab1.open:
+            import plotly.express as px
+            
+            # Balance over time visualization
+            st.subheader("Loan Balance Over Time")
+            
+            # Plot the starting balance followed by the balance at each year end
+            # Scale values to make the chart clearer (showing in thousands)
+            yearly_data = pd.DataFrame({
+                'Payment': np.append(0, annual.year * 12),
+                'Remaining Balance (Thousands)': np.append(loan_amount, annual.balance) / 1000
+            })
+            
+            balance_fig = px.line(
+                yearly_data, 
+                x='Payment', 
+                y='Remaining Balance (Thousands)',
+                title="Remaining Loan Balance Over Time",
+                labels={"Payment": "Payment Number (Month)", "Remaining Balance (Thousands)": "Remaining Balance ($, thousands)"}
+            )
+            
+            # Improve the styling
+            balance_fig.update_traces(line=dict(width=3))
+            balance_fig.update_layout(
+                xaxis=dict(showgrid=True),
+                yaxis=dict(showgrid=True)
+            )
+            
+            st.plotly_chart(balance_fig)
+            
+            # Principal vs Interest over time
+            st.subheader("Principal vs Interest Payments")
+            # Show yearly data for this chart as well
+            year_end = annual.year * 12
+            payment_data = pd.DataFrame({
+                'Payment': np.concatenate([year_end, year_end]),
+                'Payment Type': np.repeat(['Interest', 'Principal'], len(annual)),
+                'Amount': np.concatenate([annual.interest, annual.principal])
+            })
+            
+            payment_fig = px.line(
+                payment_data, 
+                x='Payment', 
+                y='Amount', 
+                color='Payment Type',
+                title="Principal vs Interest Payments Over Time (Yearly)",
+                labels={"Payment": "Payment (Month)", "Amount": "Amount ($)"}
+            )
+            st.plotly_chart(payment_fig)
+
+    with tab2:
+        if tab2.open:
+            import plotly.express as px
+            
+            # Payment breakdown pie chart
+            total_interest = loan.total_interest
+            data = pd.DataFrame({
+                'Category': ['Principal', 'Interest'],
+                'Amount': [loan_amount, total_interest]
+            })
+            
+            fig = px.pie(
+                data, 
+                values='Amount', 
+                names='Category',
+                title="Principal vs Interest",
+                color_discrete_sequence=px.colors.qualitative.Set2
+            )
+            st.plotly_chart(fig)
+
+    with tab_sensitivity:
+        if tab_sensitivity.open:
+            import plotly.express as px
+            
+            # What-if grid: rates within 2% of the input in 5 bp steps, terms of 5-40 years
+            st.subheader("What If the Rate or Term Were Different?")
+            grid = sensitivity_grid(loan_amount, rate_range(interest_rate), np.arange(5, 41))
+            
+            for values, title, label in [
+                (grid.payment, "Monthly Payment", "Payment ($)"),
+                (grid.total_interest, "Total Interest", "Interest ($)")
+            ]:
+                heatmap_fig = px.imshow(
+                    values,
+                    x=grid.terms,
+                    y=grid.rates,
+                    origin='lower',
+                    aspect='auto',
+                    color_continuous_scale='Viridis',
+                    title=f"{title} by Interest Rate and Loan Term",
+                    labels={"x": "Loan Term (Years)", "y": "Annual Interest Rate (%)", "color": label}
+                )
+                # Mark the current inputs on the grid
+                heatmap_fig.add_scatter(
+                    x=[loan_term],
+                    y=[interest_rate],
+                    mode='markers',
+                    marker=dict(color='red', size=10, symbol='x'),
+                    name='Your loan',
+                    showlegend=False
+                )
+                st.plotly_chart(heatmap_fig)
+
+    with tab3:
+        if tab3.open:
+            render_schedule_table(loan_amount, interest_rate, loan_term)
+
+# Visualization section
+st.header("Mortgage Visualization")
+render_visualizations(loan_amount, interest_rate, loan_term)
+
+# Loans from an on-disk schedule store, if one is selected in the sidebar
+render_store_browser()
+
 # Additional mortgage information
 st.header("Additional Information")
 with st.expander("What is a mortgage?"):
@@ -225,6 +282,10 @@ with st.expander("Mortgage Terminology"):
     - **Monthly Payment**: The amount paid each month, including principal and interest
     """)
 
+render_cache_debug()
+record_timing("Full script", time.perf_counter() - script_started)
+render_timing_debug()
+
 # Footer
 st.markdown("---")
 st.markdown("*This is a simple mortgage calculator for educational purposes only. Actual mortgage terms may vary.*") 
\ No newline at end of file
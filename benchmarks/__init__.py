@@ -0,0 +1,8 @@
+"""Performance checks for the engine and the apps, run with `python -m benchmarks.<name>`."""
+
+import timeit
+
+
+def best_of(function, repeat=5, number=1):
+    """Fastest time per call of `function`, over `repeat` rounds of `number` calls."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
@@ -0,0 +1,51 @@
+"""Annuity-factor table lookups versus direct evaluation.
+
+    python -m benchmarks.annuity_table
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks import best_of
+from mortgage_engine.annuity import monthly_payment
+from mortgage_engine.annuity_table import AnnuityTable
+
+LOANS = 1_000_000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(50_000, 1_000_000, LOANS)
+    grid_rates = rng.integers(1, 2000, LOANS) / 100
+    rates = rng.uniform(0.01, 20, LOANS)
+    terms = rng.choice([10, 15, 20, 25, 30, 40], LOANS)
+
+    build_time = best_of(AnnuityTable.build, repeat=3)
+    table = AnnuityTable.build()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "annuity.npy")
+        table.save(path)
+        load_time = best_of(lambda: AnnuityTable.load(path))
+
+    print(f"table: {table.factors.shape[0]} rates x {table.factors.shape[1]} months, "
+          f"{table.factors.nbytes / 1e6:.1f} MB")
+    print(f"build {build_time * 1e3:8.2f} ms    load (mmap) {load_time * 1e3:8.2f} ms")
+    print(f"\n{LOANS:,} payments")
+    print(f"direct formula       {best_of(lambda: monthly_payment(amounts, rates, terms)) * 1e3:8.2f} ms")
+    print(f"exact lookup         {best_of(lambda: amounts * table.exact(grid_rates, terms * 12)) * 1e3:8.2f} ms")
+    print(f"interpolated lookup  {best_of(lambda: table.monthly_payment(amounts, rates, terms)) * 1e3:8.2f} ms")
+
+    print("\nsingle payment (slider interaction)")
+    print(f"direct formula       {best_of(lambda: monthly_payment(300_000, 4.5, 30)) * 1e6:8.2f} us")
+    print(f"exact lookup         {best_of(lambda: 300_000 * table.exact(4.5, 360)) * 1e6:8.2f} us")
+
+    direct = monthly_payment(amounts, rates, terms)
+    error = np.abs(table.monthly_payment(amounts, rates, terms) - direct)
+    exact_error = np.abs(amounts * table.exact(grid_rates, terms * 12) - monthly_payment(amounts, grid_rates, terms))
+    print(f"\nmax abs error: exact ${exact_error.max():.2e}, interpolated ${error.max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Exact integer-cents schedules versus the float engine.
+
+    python -m benchmarks.exact_schedule
+
+Both paths are timed with the unit-schedule cache cleared before every call,
+so each one builds its schedule from scratch.
+"""
+
+from benchmarks import best_of
+from mortgage_engine import amortization_schedule, clear_schedule_cache
+from mortgage_engine.exact import exact_schedule, exact_schedule_stats, sequential_exact_schedule
+
+LOANS = ((300_000, 4.5, 30), (300_000, 4.5, 40), (8_246_576.62, 14.944, 34))
+
+
+def cold(function):
+    def run():
+        clear_schedule_cache()
+        function()
+    return run
+
+
+def main():
+    print(f"{'loan':<28} {'float':>9} {'exact':>9} {'ratio':>6} {'revisited':>9} {'per-month loop':>15}")
+    for loan in LOANS:
+        float_time = best_of(cold(lambda: amortization_schedule(*loan)), repeat=300)
+        exact_time = best_of(cold(lambda: exact_schedule(*loan)), repeat=300)
+        loop_time = best_of(lambda: sequential_exact_schedule(*loan), repeat=5)
+        schedule, revisited = exact_schedule_stats(*loan)
+        reference = sequential_exact_schedule(*loan)
+        assert all((getattr(schedule, column) == getattr(reference, column)).all()
+                   for column in ("month", "payment", "principal", "interest", "balance"))
+        label = f"${loan[0]:,.2f} {loan[1]}% {loan[2]}y"
+        print(f"{label:<28} {float_time * 1e6:>6.0f} us {exact_time * 1e6:>6.0f} us "
+              f"{exact_time / float_time:>5.2f}x {revisited:>9} {loop_time * 1e6:>12.0f} us")
+
+    schedule = exact_schedule(300_000, 4.5, 40)
+    print(f"\n480 months: regular payment ${schedule.regular_payment / 100:,.2f}, "
+          f"final payment ${schedule.final_payment / 100:,.2f}, final balance {schedule.balance[-1]} cents")
+
+
+if __name__ == "__main__":
+    main()
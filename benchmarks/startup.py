@@ -0,0 +1,86 @@
+"""Cold-start, first-paint time and memory of each Streamlit page.
+
+    python -m benchmarks.startup
+
+Every page is measured in a fresh interpreter, so imports are paid exactly as
+on a cold worker. "Cold start" is the whole process up to the first finished
+script run, "first paint" is that first run alone (including any imports the
+page triggers) and "rerun" is a second, warm run. "Peak RSS" is the process's
+maximum resident memory, and the heavy optional modules the page pulled in
+are listed last.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# (label, entry script, page of a multipage app or None)
+PAGES = [
+    ("Calculator (app.py)", "app.py", None),
+    ("Calculator (mortgage.py)", "mortgage.py", "views/calculator.py"),
+    ("ChatGPT (mortgage.py)", "mortgage.py", "views/chat.py"),
+]
+# Streamlit itself imports plotly.graph_objects when Plotly is installed, so
+# the app's own Plotly cost shows up as plotly.express.
+HEAVY_MODULES = ["plotly.express", "pyarrow", "openai", "matplotlib"]
+
+
+def measure(script, page):
+    """Run inside the fresh interpreter; print the measurements as JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, script), default_timeout=120)
+    if page:
+        app.switch_page(page)
+    started = time.perf_counter()
+    app.run()
+    first_paint = time.perf_counter() - started
+    started = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter() - started
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    print(json.dumps({
+        "first_paint": first_paint,
+        "rerun": rerun,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "modules": [module for module in HEAVY_MODULES if module in sys.modules],
+    }))
+
+
+def run_page(script, page):
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--measure", script, page or ""],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    cold_start = time.perf_counter() - started
+    result = json.loads(output.strip().splitlines()[-1])
+    result["cold_start"] = cold_start
+    return result
+
+
+def main():
+    print(f"{'page':<28}{'cold start':>12}{'first paint':>13}{'rerun':>10}{'peak RSS':>12}  heavy modules")
+    for label, script, page in PAGES:
+        result = run_page(script, page)
+        print(
+            f"{label:<28}{result['cold_start'] * 1e3:>9.0f} ms"
+            f"{result['first_paint'] * 1e3:>10.0f} ms{result['rerun'] * 1e3:>7.0f} ms"
+            f"{result['peak_rss_mb']:>9.0f} MB  {', '.join(result['modules']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], sys.argv[3] or None)
+    else:
+        main()
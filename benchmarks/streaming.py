@@ -0,0 +1,73 @@
+"""Peak memory of writing many schedules: whole tables versus streamed chunks.
+
+    python -m benchmarks.streaming
+
+Each approach writes the same loans to a Parquet file. Peak memory is the
+most NumPy/pandas memory alive at once (tracemalloc) plus the most Arrow
+memory alive at once (Arrow's own allocator, which tracemalloc cannot see).
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from mortgage_engine.cli import run_batch
+from mortgage_engine.export import to_table, write_chunks, write_tables
+from mortgage_engine.schedule import batch_schedule, iter_batch_columns
+
+LOANS = 20_000
+
+
+def measure(function):
+    """Run `function` twice: once for time, once traced; return (seconds, python peak, arrow peak)."""
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+
+    pool = pa.proxy_memory_pool(pa.default_memory_pool())
+    previous_pool = pa.default_memory_pool()
+    pa.set_memory_pool(pool)
+    tracemalloc.start()
+    try:
+        function()
+        _, python_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        pa.set_memory_pool(previous_pool)
+    return elapsed, python_peak, pool.max_memory()
+
+
+def main():
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(50_000, 1_000_000, LOANS).round(2)
+    rates = rng.uniform(0, 12, LOANS).round(3)
+    terms = rng.choice([10, 15, 20, 30, 40], LOANS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        out = os.path.join(directory, "schedules.parquet")
+        tape = os.path.join(directory, "loans.csv")
+        pd.DataFrame({"loan_amount": amounts, "interest_rate": rates, "loan_term": terms}).to_csv(tape, index=False)
+
+        approaches = [
+            ("DataFrame", lambda: pd.DataFrame(batch_schedule(amounts, rates, terms).columns()).to_parquet(out)),
+            ("one Arrow table", lambda: write_tables([to_table(batch_schedule(amounts, rates, terms).columns())], out)),
+            ("streamed, 1Mi rows", lambda: write_chunks(iter_batch_columns(amounts, rates, terms), out)),
+            ("streamed, 64Ki rows", lambda: write_chunks(iter_batch_columns(amounts, rates, terms, chunk_rows=2**16), out)),
+            ("CLI batch (tape)", lambda: run_batch(tape, out)),
+        ]
+        rows = int(terms.sum()) * 12
+        print(f"{LOANS:,} loans, {rows:,} rows to Parquet")
+        print(f"{'approach':<20} {'time':>8} {'NumPy peak':>11} {'Arrow peak':>11} {'total':>9}")
+        for name, function in approaches:
+            elapsed, python_peak, arrow_peak = measure(function)
+            print(f"{name:<20} {elapsed:>6.2f} s {python_peak / 2**20:>7.0f} MiB {arrow_peak / 2**20:>7.0f} MiB "
+                  f"{(python_peak + arrow_peak) / 2**20:>5.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
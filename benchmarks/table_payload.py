@@ -0,0 +1,73 @@
+"""Schedule table payload: pandas Styler versus st.column_config formatting,
+and the compact schedule frames (int16 months, no Payment column).
+
+    python -m benchmarks.table_payload
+
+Each table is marshalled the way `st.dataframe` does it, and the size of the
+resulting protobuf is what the browser receives for that element.
+"""
+
+import pandas as pd
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+from streamlit.elements.lib.column_config_utils import (
+    INDEX_IDENTIFIER,
+    marshall_column_config,
+    process_config_mapping,
+    update_column_config,
+)
+from streamlit.elements.lib.pandas_styler_utils import marshall_styler
+from streamlit.proto.Dataframe_pb2 import Dataframe as DataframeProto
+
+from benchmarks import best_of
+from mortgage_engine import amortization_schedule
+from ui_helpers import MONEY_COLUMNS, currency_column_config, schedule_frame
+
+ROWS = (12, 360, 480)
+
+
+def styler_payload(schedule, rows):
+    df = pd.DataFrame(schedule.slice(0, rows).columns())
+    styler = df.style.format({column: "${:.2f}" for column in MONEY_COLUMNS})
+    proto = DataframeProto()
+    marshall_styler(proto.arrow_data, styler, "benchmark")
+    proto.arrow_data.data = convert_pandas_df_to_arrow_bytes(df)
+    return proto.ByteSize()
+
+
+def column_config_payload(schedule, rows, compact=False):
+    df = schedule_frame(schedule.slice(0, rows), compact=compact)
+    proto = DataframeProto()
+    proto.arrow_data.data = convert_pandas_df_to_arrow_bytes(df)
+    mapping = process_config_mapping(currency_column_config(MONEY_COLUMNS))
+    update_column_config(mapping, INDEX_IDENTIFIER, {"hidden": True})
+    marshall_column_config(proto, mapping)
+    return proto.ByteSize()
+
+
+def main():
+    schedule = amortization_schedule(300_000, 4.5, 40)
+
+    print(f"{'rows':>5} {'method':<14} {'payload':>10} {'serialize':>11}")
+    for rows in ROWS:
+        for name, payload in (
+            ("Styler", styler_payload),
+            ("column_config", column_config_payload),
+            ("compact", lambda schedule, rows: column_config_payload(schedule, rows, compact=True)),
+        ):
+            size = payload(schedule, rows)
+            seconds = best_of(lambda: payload(schedule, rows), number=10)
+            print(f"{rows:>5} {name:<14} {size / 1024:>7.1f} KB {seconds * 1e3:>8.2f} ms")
+
+    print(f"\nfull {len(schedule)}-month frame in memory")
+    for name, options in (
+        ("float64", {}),
+        ("compact", {"compact": True}),
+        ("compact float32", {"compact": True, "money": "float32"}),
+        ("compact cents", {"compact": True, "money": "cents"}),
+    ):
+        frame = schedule_frame(schedule, **options)
+        print(f"{name:<16} {frame.memory_usage(deep=True).sum() / 1024:>7.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Shared amortization engine used by the Streamlit mortgage apps."""
+
+from mortgage_engine.annuity import monthly_payment, monthly_rate
+from mortgage_engine.cache import TTLCache
+from mortgage_engine.loan import Loan
+from mortgage_engine.schedule import (
+    AnnualSummary,
+    BatchSchedule,
+    Schedule,
+    amortization_schedule,
+    batch_schedule,
+    clear_schedule_cache,
+    schedule_cache_info,
+    schedule_key,
+)
+
+__all__ = [
+    "AnnualSummary",
+    "BatchSchedule",
+    "Loan",
+    "Schedule",
+    "TTLCache",
+    "amortization_schedule",
+    "batch_schedule",
+    "clear_schedule_cache",
+    "monthly_payment",
+    "monthly_rate",
+    "schedule_cache_info",
+    "schedule_key",
+]
@@ -0,0 +1,49 @@
+"""Closed-form annuity formulas shared by the schedule engine.
+
+The kernels are written with `log1p`/`expm1` instead of `(1 + r) ** n`, which
+keeps full precision for tiny rates where `(1 + r) ** n - 1` would cancel,
+and are defined at a zero rate (straight-line repayment) without branching
+per element, so whole arrays of mixed rates are handled in one call.
+"""
+
+import numpy as np
+
+
+def monthly_rate(interest_rate):
+    """Convert an annual percentage rate (e.g. 4.5) into a monthly rate."""
+    return np.asarray(interest_rate, dtype=np.float64) / 100 / 12
+
+
+def _log_growth(rate):
+    # log(1 + r); zero rates are swapped for 1 so the division below stays
+    # finite, and their results are replaced by the r -> 0 limit.
+    rate = np.asarray(rate, dtype=np.float64)
+    zero = rate == 0
+    safe_rate = np.where(zero, 1.0, rate)
+    return safe_rate, np.log1p(safe_rate), zero
+
+
+def payment_factor(rate, n):
+    """Monthly payment per unit of principal for `n` payments at `rate`."""
+    safe_rate, log_growth, zero = _log_growth(rate)
+    # r / (1 - (1 + r) ** -n)
+    factor = safe_rate / -np.expm1(-n * log_growth)
+    return np.where(zero, 1 / np.asarray(n, dtype=np.float64), factor)
+
+
+def balance_factor(rate, n, k):
+    """Remaining balance per unit of principal after `k` of `n` payments."""
+    _, log_growth, zero = _log_growth(rate)
+    n = np.asarray(n, dtype=np.float64)
+    # ((1 + r) ** n - (1 + r) ** k) / ((1 + r) ** n - 1). The placeholder
+    # rate of zero-rate entries overflows past ~1,000 months; those results
+    # are discarded below, so silence the warnings they raise.
+    with np.errstate(over="ignore", invalid="ignore"):
+        growth_n = np.expm1(n * log_growth)
+        factor = (growth_n - np.expm1(k * log_growth)) / growth_n
+    return np.where(zero, (n - k) / n, factor)
+
+
+def monthly_payment(loan_amount, interest_rate, loan_term):
+    """Monthly payment for a loan given the annual rate (%) and term (years)."""
+    return loan_amount * payment_factor(monthly_rate(interest_rate), loan_term * 12)
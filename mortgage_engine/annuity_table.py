@@ -0,0 +1,101 @@
+"""Precomputed annuity (payment) factors on a rate x term grid.
+
+Rows are annual rates from 0% to 20% in fixed basis-point steps and columns
+are terms of 1 to 480 months, so a payment becomes `amount * factor` with the
+factor read from the table. Rates on the grid are looked up exactly; rates
+between grid points are linearly interpolated. Tables can be saved to `.npy`
+and loaded back memory-mapped.
+"""
+
+import os
+
+import numpy as np
+
+from mortgage_engine.annuity import monthly_rate, payment_factor
+
+MAX_RATE_BP = 2000
+MAX_TERM_MONTHS = 480
+DEFAULT_STEP_BP = 1
+
+
+def _table_paths(path):
+    """Factor and metadata file names for a table saved at `path`.
+
+    np.save appends ".npy" when it is missing, so both names are built from
+    the path without that suffix.
+    """
+    base, extension = os.path.splitext(str(path))
+    if extension != ".npy":
+        base = str(path)
+    return f"{base}.npy", f"{base}.meta.npz"
+
+
+class AnnuityTable:
+    """Payment factors indexed by (rate step, term month)."""
+
+    def __init__(self, factors, step_bp=DEFAULT_STEP_BP):
+        self.factors = factors
+        self.step_bp = step_bp
+
+    @classmethod
+    def build(cls, step_bp=DEFAULT_STEP_BP, max_rate_bp=MAX_RATE_BP, max_term_months=MAX_TERM_MONTHS):
+        rate_bp = np.arange(0, max_rate_bp + step_bp, step_bp)
+        months = np.arange(1, max_term_months + 1)
+        factors = payment_factor(monthly_rate(rate_bp / 100)[:, None], months)
+        return cls(factors, step_bp)
+
+    @classmethod
+    def load(cls, path):
+        """Load a table saved with `save`, memory-mapped read-only."""
+        factors_path, meta_path = _table_paths(path)
+        factors = np.load(factors_path, mmap_mode="r")
+        with np.load(meta_path) as meta:
+            step_bp = int(meta["step_bp"])
+        return cls(factors, step_bp)
+
+    @classmethod
+    def load_or_build(cls, path, step_bp=DEFAULT_STEP_BP):
+        """Load the table at `path`, building and saving it first if missing."""
+        if not os.path.exists(_table_paths(path)[0]):
+            cls.build(step_bp).save(path)
+        return cls.load(path)
+
+    def save(self, path):
+        factors_path, meta_path = _table_paths(path)
+        np.save(factors_path, self.factors)
+        np.savez(meta_path, step_bp=self.step_bp)
+
+    @property
+    def max_rate(self):
+        return (self.factors.shape[0] - 1) * self.step_bp / 100
+
+    def _position(self, interest_rate, term_months):
+        position = np.asarray(interest_rate, dtype=np.float64) * 100 / self.step_bp
+        term_months = np.asarray(term_months)
+        if position.min() < 0 or position.max() > self.factors.shape[0] - 1:
+            raise ValueError(f"Interest rate outside the table's 0-{self.max_rate:g}% range")
+        if term_months.min() < 1 or term_months.max() > self.factors.shape[1]:
+            raise ValueError(f"Term outside the table's 1-{self.factors.shape[1]} month range")
+        # Terms read from a CSV tape arrive as floats like 360.0
+        if np.any(term_months != np.trunc(term_months)):
+            raise ValueError("Term must be a whole number of months")
+        return position, term_months.astype(np.intp) - 1
+
+    def exact(self, interest_rate, term_months):
+        """Factors for annual rates (%) that lie on the grid."""
+        position, column = self._position(interest_rate, term_months)
+        row = np.rint(position).astype(np.intp)
+        if np.abs(row - position).max() > 1e-6:
+            raise ValueError("Interest rate is not on the table grid; use interpolate()")
+        return self.factors[row, column]
+
+    def interpolate(self, interest_rate, term_months):
+        """Factors for any annual rate (%), linearly interpolated between rows."""
+        position, column = self._position(interest_rate, term_months)
+        row = np.minimum(position.astype(np.intp), self.factors.shape[0] - 2)
+        weight = position - row
+        return (1 - weight) * self.factors[row, column] + weight * self.factors[row + 1, column]
+
+    def monthly_payment(self, loan_amount, interest_rate, loan_term):
+        """Monthly payment for annual rates (%) and terms in years, interpolated."""
+        return loan_amount * self.interpolate(interest_rate, np.asarray(loan_term) * 12)
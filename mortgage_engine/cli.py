@@ -0,0 +1,217 @@
+"""Command-line entry point for bulk schedule generation.
+
+    python -m mortgage_engine batch loans.csv --out schedules.parquet
+
+The loan tape is a CSV with `loan_amount`, `interest_rate` (annual, in
+percent) and `loan_term` (years) columns, plus an optional `loan_id`, which
+is always read as text. It is
+read in chunks and every chunk's schedules are streamed to the writer in
+blocks of rows before the next one is read, so memory stays bounded
+regardless of the size of the tape.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mortgage_engine.export import output_extension, to_table, write_tables
+from mortgage_engine.portfolio import price_portfolio
+from mortgage_engine.schedule import DEFAULT_CHUNK_SIZE, SCHEDULE_CHUNK_ROWS, iter_batch_columns
+from mortgage_engine.store import write_store
+
+LOAN_COLUMNS = ["loan_amount", "interest_rate", "loan_term"]
+
+
+def read_loan_tape(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the loan tape as dicts of column arrays, `chunk_size` loans each.
+
+    Raises ValueError for missing columns and for rows with a blank loan field.
+    """
+    start = 0
+    # Each chunk infers its own dtypes, so IDs that look numeric early on
+    # would otherwise change type once alphanumeric ones appear.
+    for frame in pd.read_csv(path, chunksize=chunk_size, dtype={"loan_id": str}):
+        missing = [column for column in LOAN_COLUMNS if column not in frame]
+        if missing:
+            raise ValueError(f"Loan tape is missing columns: {', '.join(missing)}")
+        fields = LOAN_COLUMNS + (["loan_id"] if "loan_id" in frame else [])
+        blank = np.flatnonzero(frame[fields].isna().any(axis=1).to_numpy())
+        if len(blank):
+            # Line 1 of the tape is the header.
+            lines = ", ".join(str(start + row + 2) for row in blank[:5])
+            more = f" and {len(blank) - 5} more" if len(blank) > 5 else ""
+            raise ValueError(f"Loan tape has blank loan fields on line {lines}{more}")
+        chunk = {column: frame[column].to_numpy() for column in LOAN_COLUMNS}
+        if "loan_id" in frame:
+            chunk["loan_id"] = frame["loan_id"].to_numpy()
+        else:
+            chunk["loan_id"] = np.arange(start, start + len(frame))
+        start += len(frame)
+        yield chunk
+
+
+def schedule_chunk(chunk, chunk_rows=SCHEDULE_CHUNK_ROWS):
+    """Yield the long-format schedules of one chunk as Arrow tables.
+
+    Each table holds at most `chunk_rows` rows (see iter_batch_columns).
+    """
+    for columns in iter_batch_columns(
+        chunk["loan_amount"], chunk["interest_rate"], chunk["loan_term"], chunk["loan_id"], chunk_rows
+    ):
+        yield to_table(columns)
+
+
+def _schedule_chunk_tables(chunk):
+    # Worker processes hand back all of a chunk's tables at once.
+    return list(schedule_chunk(chunk))
+
+
+def iter_schedule_tables(chunks, workers=1):
+    """Schedule each chunk, in order, optionally across worker processes.
+
+    Yields the number of loans in each chunk and an iterable of its tables.
+    In a single process the tables are only built as the writer consumes
+    them, so one table's worth of rows is held at a time.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk["loan_id"]), schedule_chunk(chunk)
+        return
+
+    # Keep only a couple of chunks per worker in flight to bound memory.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((len(chunk["loan_id"]), pool.submit(_schedule_chunk_tables, chunk)))
+            if len(pending) >= 2 * workers:
+                chunk_loans, tables = pending.popleft()
+                yield chunk_loans, tables.result()
+        while pending:
+            chunk_loans, tables = pending.popleft()
+            yield chunk_loans, tables.result()
+
+
+def run_batch(loans, out, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    """Write schedules for every loan on the tape to `out`; return (loans, rows)."""
+    loan_counts = []
+
+    def tables():
+        for chunk_loans, chunk_tables in iter_schedule_tables(read_loan_tape(loans, chunk_size), workers):
+            loan_counts.append(chunk_loans)
+            yield from chunk_tables
+
+    try:
+        rows = write_tables(tables(), out)
+    except BaseException:
+        # A failure part-way through the tape must not leave a truncated file.
+        if os.path.exists(out):
+            os.remove(out)
+        raise
+    return sum(loan_counts), rows
+
+
+def read_loan_columns(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read the whole tape's input columns; these are small next to the schedules."""
+    chunks = list(read_loan_tape(path, chunk_size))
+    return {
+        column: np.concatenate([chunk[column] for chunk in chunks])
+        for column in LOAN_COLUMNS + ["loan_id"]
+    }
+
+
+def run_portfolio(loans, out=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Price the whole tape as one portfolio and optionally write monthly totals."""
+    tape = read_loan_columns(loans, chunk_size)
+    cash_flows = price_portfolio(
+        tape["loan_amount"], tape["interest_rate"], tape["loan_term"],
+        workers=workers,
+        chunk_size=chunk_size,
+    )
+    if out is not None:
+        table = to_table({
+            "Month": cash_flows.month,
+            "Payment": cash_flows.payment,
+            "Principal": cash_flows.principal,
+            "Interest": cash_flows.interest,
+            "Remaining Balance": cash_flows.balance,
+        })
+        write_tables([table], out)
+    return cash_flows
+
+
+def run_store(loans, out, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write the tape's schedules into a memory-mapped store directory."""
+    tape = read_loan_columns(loans, chunk_size)
+    return write_store(
+        out, tape["loan_amount"], tape["interest_rate"], tape["loan_term"],
+        loan_ids=tape["loan_id"], chunk_size=chunk_size,
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m mortgage_engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="compute schedules for every loan on a loan tape")
+    batch.add_argument("loans", help="CSV loan tape with loan_amount, interest_rate and loan_term")
+    batch.add_argument(
+        "--out", required=True, help="output file (.parquet, .feather, .arrow, .csv or .csv.gz)"
+    )
+    batch.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="loans per chunk")
+    batch.add_argument("--workers", type=int, default=1, help="worker processes")
+
+    portfolio = commands.add_parser("portfolio", help="total monthly cash flows of a loan tape")
+    portfolio.add_argument("loans", help="CSV loan tape with loan_amount, interest_rate and loan_term")
+    portfolio.add_argument("--out", help="optional output file for the monthly totals")
+    portfolio.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="loans per chunk")
+    portfolio.add_argument("--workers", type=int, help="worker processes (default: all CPUs)")
+
+    store = commands.add_parser("store", help="write schedules into a memory-mapped store directory")
+    store.add_argument("loans", help="CSV loan tape with loan_amount, interest_rate and loan_term")
+    store.add_argument("--out", required=True, help="store directory")
+    store.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="loans per chunk")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        started = time.perf_counter()
+        try:
+            output_extension(args.out)
+            loans, rows = run_batch(args.loans, args.out, args.chunk_size, args.workers)
+        except ValueError as exc:
+            parser.error(str(exc))
+        elapsed = time.perf_counter() - started
+        print(f"Wrote {rows} rows for {loans} loans to {args.out} in {elapsed:.2f}s", file=sys.stderr)
+    elif args.command == "portfolio":
+        try:
+            if args.out is not None:
+                output_extension(args.out)
+            cash_flows = run_portfolio(args.loans, args.out, args.workers, args.chunk_size)
+        except ValueError as exc:
+            parser.error(str(exc))
+        print(
+            f"Priced {cash_flows.loans} loans on {cash_flows.workers} workers in "
+            f"{cash_flows.elapsed:.2f}s ({cash_flows.loans_per_second_per_core:,.0f} loans/s per core)",
+            file=sys.stderr,
+        )
+    elif args.command == "store":
+        started = time.perf_counter()
+        try:
+            store = run_store(args.loans, args.out, args.chunk_size)
+        except ValueError as exc:
+            parser.error(str(exc))
+        elapsed = time.perf_counter() - started
+        print(
+            f"Stored {len(store)} loans x {store.months} months in {args.out} in {elapsed:.2f}s",
+            file=sys.stderr,
+        )
+    return 0
@@ -0,0 +1,233 @@
+"""Exact amortization in integer cents, rounded the way lenders do.
+
+The monthly payment is rounded to the cent, each month's interest is the
+opening balance times the monthly rate rounded half up to the cent, and the
+final payment is adjusted so the loan ends at exactly zero.
+
+Month by month this is a sequential recurrence, but the closed form with
+the rounded payment is usually within a few cents of it, and being a few
+cents off only matters for months whose interest is close to a half cent.
+`exact_schedule` rounds the interest of the closed-form balances in one
+vectorized pass and then revisits just those few months in order, so the
+result is identical to the month-by-month loop without running it.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# Rates are held exactly as integers in millionths of a percent, so interest
+# is computed and rounded with integer arithmetic and never lands on the
+# wrong side of a half cent through float error.
+RATE_SCALE = 10**6
+
+
+def _rate_units(interest_rate):
+    return round(float(interest_rate) * RATE_SCALE)
+
+
+def monthly_interest(balance_cents, interest_rate):
+    """Interest on `balance_cents` for one month, rounded half up to the cent."""
+    denominator = 12 * 100 * RATE_SCALE
+    numerator = np.asarray(balance_cents, dtype=np.int64) * _rate_units(interest_rate)
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+@dataclass(frozen=True)
+class ExactSchedule:
+    """Columnar amortization schedule in int64 cents.
+
+    `payment` has one entry per month: the regular payment, except for the
+    last month, which pays off whatever balance is left.
+    """
+
+    month: np.ndarray
+    payment: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+
+    def __len__(self):
+        return len(self.month)
+
+    @property
+    def year(self):
+        return (self.month - 1) // 12 + 1
+
+    @property
+    def regular_payment(self):
+        return int(self.payment[0])
+
+    @property
+    def final_payment(self):
+        return int(self.payment[-1])
+
+    def slice(self, start, stop):
+        """Rows `start` to `stop` (0-based, exclusive) as an ExactSchedule of views."""
+        return ExactSchedule(
+            month=self.month[start:stop],
+            payment=self.payment[start:stop],
+            principal=self.principal[start:stop],
+            interest=self.interest[start:stop],
+            balance=self.balance[start:stop],
+        )
+
+    def columns(self, names=None):
+        """Return the schedule in dollars, with the same columns as Schedule.columns."""
+        columns = {
+            "Month": self.month,
+            "Payment": self.payment / 100,
+            "Principal": self.principal / 100,
+            "Interest": self.interest / 100,
+            "Remaining Balance": self.balance / 100,
+            "Year": self.year,
+        }
+        if names is None:
+            return columns
+        return {label: columns[column] for column, label in names}
+
+
+def _payment_cents(principal_cents, rate, total_payments):
+    """Regular payment for a loan, rounded half up to the cent."""
+    if rate == 0:
+        return (2 * principal_cents + total_payments) // (2 * total_payments)
+    return math.floor(principal_cents * rate / -math.expm1(-total_payments * math.log1p(rate)) + 0.5)
+
+
+def _opening_guess(principal_cents, payment, rate, total_payments):
+    """Balance before each payment, from the closed form, rounded to the cent.
+
+    After k payments of `payment` the balance is
+    P (1 + r) ** k - payment ((1 + r) ** k - 1) / r, i.e. P plus a multiple
+    of (1 + r) ** k - 1; only the per-month interest rounding is ignored.
+    """
+    k = np.arange(total_payments)
+    if rate == 0:
+        opening = principal_cents - payment * k
+    else:
+        opening = np.expm1(k * math.log1p(rate))
+        opening *= principal_cents - payment / rate
+        opening += principal_cents
+    return np.rint(opening).astype(np.int64)
+
+
+def _settle_interest(principal_cents, payment, opening, interest_rate):
+    """Round each month's interest the way the sequential recurrence would.
+
+    `opening` is a guess of the balance before each payment; it is replaced
+    in place by the balances the rounded interest of that guess leads to.
+    Those are usually off by a few cents, and a shift of s cents can only
+    change the rounding of months whose interest is within s times the
+    monthly rate of a half cent. One vectorized pass finds those months and
+    a short loop settles them in order, carrying the shift forward. Returns
+    the interest and the number of months the loop had to visit.
+    """
+    rate_twice = 2 * _rate_units(interest_rate)
+    divisor = 2 * 12 * 100 * RATE_SCALE
+    interest = (opening * rate_twice + divisor // 2) // divisor
+    opening[1:] = principal_cents - np.cumsum(payment - interest[:-1])
+    settled, remainder = np.divmod(opening * rate_twice + divisor // 2, divisor)
+    drift = settled - interest
+
+    # Visit the months a shift of up to `margin` cents could change. If the
+    # balances drift further than that, months up to that point are already
+    # settled, so carry on from there with a wider margin.
+    changes = []
+    shift, start, margin, visited = 0, 0, 8, 0
+    while start < len(opening):
+        reach = margin * rate_twice
+        months = start + np.flatnonzero(
+            (drift[start:] != 0) | (remainder[start:] < reach) | (remainder[start:] >= divisor - reach)
+        )
+        start = len(opening)
+        for month, month_drift, month_remainder in zip(
+            months.tolist(), drift[months].tolist(), remainder[months].tolist()
+        ):
+            visited += 1
+            change = month_drift + (month_remainder + shift * rate_twice) // divisor
+            if change:
+                changes.append((month, change))
+                shift += change
+                if abs(shift) > margin and reach < divisor:
+                    start, margin = month + 1, 2 * abs(shift)
+                    break
+
+    for month, change in changes:
+        interest[month] += change
+    opening[1:] = principal_cents - np.cumsum(payment - interest[:-1])
+    return interest, visited
+
+
+def _loan_cents(loan_amount, interest_rate, loan_term):
+    """Principal in cents, number of payments and the rounded regular payment."""
+    principal_cents = round(float(loan_amount) * 100)
+    total_payments = int(loan_term) * 12
+    rate = _rate_units(interest_rate) / (12 * 100 * RATE_SCALE)
+    return principal_cents, total_payments, _payment_cents(principal_cents, rate, total_payments)
+
+
+def exact_schedule(loan_amount, interest_rate, loan_term):
+    """Build the lender-rounded schedule for a loan, in cents.
+
+    Arguments are as for `amortization_schedule`; the rate is used to a
+    millionth of a percent. If the rounded payment clears the loan early
+    (only possible for tiny loans), the schedule ends in that month.
+    """
+    return exact_schedule_stats(loan_amount, interest_rate, loan_term)[0]
+
+
+def exact_schedule_stats(loan_amount, interest_rate, loan_term):
+    """`exact_schedule`, plus how many months had to be revisited one by one."""
+    principal_cents, total_payments, payment = _loan_cents(loan_amount, interest_rate, loan_term)
+    rate = _rate_units(interest_rate) / (12 * 100 * RATE_SCALE)
+    opening = _opening_guess(principal_cents, payment, rate, total_payments)
+    interest, revisited = _settle_interest(principal_cents, payment, opening, interest_rate)
+
+    # The loan ends in the last month or the first month it would be overpaid.
+    principal = payment - interest
+    closing = principal_cents - np.cumsum(principal)
+    overpaid = np.flatnonzero(closing[:-1] <= 0)
+    end = int(overpaid[0]) if len(overpaid) else total_payments - 1
+    principal = principal[: end + 1]
+    interest = interest[: end + 1]
+    principal[-1] = opening[end]
+
+    payments = np.full(end + 1, payment, dtype=np.int64)
+    payments[-1] = interest[-1] + principal[-1]
+    balance = closing[: end + 1]
+    balance[-1] = 0
+
+    schedule = ExactSchedule(
+        month=np.arange(1, end + 2),
+        payment=payments,
+        principal=principal,
+        interest=interest,
+        balance=balance,
+    )
+    return schedule, revisited
+
+
+def sequential_exact_schedule(loan_amount, interest_rate, loan_term):
+    """The same schedule as `exact_schedule`, computed one month at a time.
+
+    This is the plain lender recurrence in Python integers. It is much
+    slower and is kept as the reference the vectorized version must match.
+    """
+    principal_cents, total_payments, payment = _loan_cents(loan_amount, interest_rate, loan_term)
+    rate_twice = 2 * _rate_units(interest_rate)
+    divisor = 2 * 12 * 100 * RATE_SCALE
+
+    rows = []
+    balance = principal_cents
+    for month in range(1, total_payments + 1):
+        interest = (balance * rate_twice + divisor // 2) // divisor
+        if month == total_payments or balance <= payment - interest:
+            rows.append((month, interest + balance, balance, interest, 0))
+            break
+        balance -= payment - interest
+        rows.append((month, payment, payment - interest, interest, balance))
+
+    month, payments, principal, interest, balance = (np.array(column, dtype=np.int64) for column in zip(*rows))
+    return ExactSchedule(month=month, payment=payments, principal=principal, interest=interest, balance=balance)
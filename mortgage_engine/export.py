@@ -0,0 +1,114 @@
+"""Serialize columnar schedules for download.
+
+Columns go straight from NumPy arrays into Arrow tables, so encoding never
+walks the rows as Python objects or builds an intermediate DataFrame. The
+writers take schedules as a stream of column chunks, so only one chunk is
+converted at a time.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+ExportFormat = namedtuple("ExportFormat", ["extension", "mime"])
+
+
+def to_table(columns):
+    """Build an Arrow table from a dict of equal-length arrays."""
+    return pa.table({name: np.asarray(values) for name, values in columns.items()})
+
+
+EXPORT_FORMATS = {
+    "CSV": ExportFormat("csv", "text/csv"),
+    "CSV (gzip)": ExportFormat("csv.gz", "application/gzip"),
+    "Parquet": ExportFormat("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC / Feather": ExportFormat("feather", "application/vnd.apache.arrow.file"),
+}
+
+
+WRITER_EXTENSIONS = ("parquet", "feather", "arrow", "csv.gz", "csv")
+
+
+def output_extension(path):
+    """The writer extension `path` ends with, e.g. "csv.gz"; ValueError if none."""
+    for extension in WRITER_EXTENSIONS:
+        if str(path).endswith(f".{extension}"):
+            return extension
+    raise ValueError(f"Unsupported output format: {path}")
+
+
+def open_writer(sink, schema, extension=None):
+    """Open a streaming table writer on `sink`, a path or a writable pyarrow stream.
+
+    The format follows `extension` (e.g. "parquet" or "csv.gz"), which
+    defaults to the extension of the path. The returned writer accepts
+    `write_table(table)` calls and must be closed; rows are flushed as they
+    are written, so memory stays bounded.
+    """
+    if extension is None:
+        extension = output_extension(sink)
+    if extension == "parquet":
+        return pq.ParquetWriter(sink, schema)
+    if extension == "feather":
+        # Feather files are LZ4-compressed by default, as with feather.write_feather
+        return pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+    if extension == "arrow":
+        return pa.ipc.new_file(sink, schema)
+    if extension == "csv.gz":
+        return _CompressedCSVWriter(sink, schema)
+    if extension == "csv":
+        return pa_csv.CSVWriter(sink, schema)
+    raise ValueError(f"Unsupported output format: {extension}")
+
+
+class _CompressedCSVWriter:
+    def __init__(self, sink, schema):
+        self._stream = pa.CompressedOutputStream(sink, "gzip")
+        self._writer = pa_csv.CSVWriter(self._stream, schema)
+
+    def write_table(self, table):
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+        self._stream.close()
+
+
+def write_tables(tables, sink, extension=None):
+    """Write an iterable of Arrow tables to `sink` one at a time; return the row count.
+
+    Nothing is written if `tables` is empty. See `open_writer` for `sink`
+    and `extension`.
+    """
+    writer = None
+    rows = 0
+    try:
+        for table in tables:
+            if writer is None:
+                writer = open_writer(sink, table.schema, extension)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_chunks(chunks, sink, extension=None):
+    """Write an iterable of column dicts (e.g. Schedule.iter_columns) to `sink`."""
+    return write_tables(map(to_table, chunks), sink, extension)
+
+
+def export_bytes(chunks, format_name):
+    """Encode column chunks in one of the formats listed in EXPORT_FORMATS.
+
+    `chunks` is an iterable of column dicts, or a single dict.
+    """
+    if isinstance(chunks, dict):
+        chunks = [chunks]
+    sink = pa.BufferOutputStream()
+    write_chunks(chunks, sink, EXPORT_FORMATS[format_name].extension)
+    return sink.getvalue().to_pybytes()
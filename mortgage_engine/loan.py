@@ -0,0 +1,57 @@
+"""Random-access queries on a single loan without building its schedule.
+
+Months are 1-based payment numbers; month 0 is the start of the loan. Every
+query accepts scalars or NumPy arrays of months and is answered from the
+closed-form annuity balance, so its cost does not depend on the loan term.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from mortgage_engine.annuity import balance_factor, monthly_rate, payment_factor
+
+
+@dataclass(frozen=True)
+class Loan:
+    """A fixed-rate loan: amount, annual rate in percent and term in years."""
+
+    amount: float
+    interest_rate: float
+    term: int
+
+    @property
+    def rate(self):
+        return float(monthly_rate(self.interest_rate))
+
+    @property
+    def total_payments(self):
+        return int(self.term) * 12
+
+    @property
+    def payment(self):
+        return float(self.amount * payment_factor(self.rate, self.total_payments))
+
+    @property
+    def total_interest(self):
+        return self.payment * self.total_payments - self.amount
+
+    def balance_at(self, month):
+        """Remaining balance after `month` payments."""
+        month = np.clip(month, 0, self.total_payments)
+        balance = self.amount * balance_factor(self.rate, self.total_payments, month)
+        return np.maximum(balance, 0)
+
+    def principal_paid(self, start, end):
+        """Principal repaid over payments `start` to `end`, inclusive."""
+        start = np.asarray(start)
+        # An empty range (end before start) repays nothing
+        end = np.maximum(end, start - 1)
+        return self.balance_at(start - 1) - self.balance_at(end)
+
+    def cumulative_interest(self, start, end):
+        """Interest paid over payments `start` to `end`, inclusive."""
+        start = np.clip(start, 1, self.total_payments + 1)
+        end = np.clip(end, 0, self.total_payments)
+        payments = np.maximum(end - start + 1, 0)
+        return self.payment * payments - self.principal_paid(start, end)
@@ -0,0 +1,86 @@
+"""What-if grids over interest rates and loan terms.
+
+Payments are linear in the loan amount, so every grid is computed per unit
+of principal in one broadcast expression and scaled afterwards.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from mortgage_engine.annuity import balance_factor, monthly_rate, payment_factor
+
+
+@dataclass(frozen=True)
+class SensitivityGrid:
+    """Monthly payment and total interest for every (rate, term) pair.
+
+    `payment` and `total_interest` have one row per rate and one column per
+    term.
+    """
+
+    rates: np.ndarray
+    terms: np.ndarray
+    payment: np.ndarray
+    total_interest: np.ndarray
+
+
+def rate_range(interest_rate, span=2.0, step=0.05):
+    """Annual rates (%) from `interest_rate - span` to `+ span`, never negative."""
+    steps = int(round(span / step))
+    rates = np.round(interest_rate + np.arange(-steps, steps + 1) * step, 6)
+    return rates[rates >= 0]
+
+
+def sensitivity_grid(loan_amount, rates, terms):
+    """Payment and total interest over annual `rates` (%) x `terms` (years)."""
+    rates = np.asarray(rates, dtype=np.float64)
+    terms = np.asarray(terms)
+    total_payments = terms * 12
+    payment = loan_amount * payment_factor(monthly_rate(rates)[:, None], total_payments[None, :])
+    return SensitivityGrid(
+        rates=rates,
+        terms=terms,
+        payment=payment,
+        total_interest=payment * total_payments - loan_amount,
+    )
+
+
+class ScenarioGrid:
+    """Precomputed outcomes around one rate for interactive what-if sweeps.
+
+    Per-unit payment, total interest and year-end balances are computed once
+    for a band of rates at a fixed term. Any loan amount and any rate inside
+    the band is then answered by scaling and linearly interpolating between
+    the two neighbouring grid rates, without touching the annuity formulas.
+    """
+
+    def __init__(self, interest_rate, loan_term, span=2.0, step=0.01):
+        self.loan_term = int(loan_term)
+        self.step = step
+        self.rates = rate_range(interest_rate, span, step)
+        total_payments = self.loan_term * 12
+        rate = monthly_rate(self.rates)
+        self.payment = payment_factor(rate, total_payments)
+        self.total_interest = self.payment * total_payments - 1
+        self.year_end_months = np.arange(0, self.loan_term + 1) * 12
+        self.balance = balance_factor(rate[:, None], total_payments, self.year_end_months)
+
+    @property
+    def min_rate(self):
+        return float(self.rates[0])
+
+    @property
+    def max_rate(self):
+        return float(self.rates[-1])
+
+    def at(self, loan_amount, interest_rate):
+        """Payment, total interest and year-end balances for one scenario."""
+        position = np.clip((interest_rate - self.rates[0]) / self.step, 0, len(self.rates) - 1)
+        row = min(int(position), len(self.rates) - 2)
+        weight = position - row
+
+        def interpolate(values):
+            return loan_amount * ((1 - weight) * values[row] + weight * values[row + 1])
+
+        return interpolate(self.payment), interpolate(self.total_interest), interpolate(self.balance)
@@ -0,0 +1,336 @@
+"""Vectorized amortization schedules.
+
+Every column of the schedule is computed for all months at once from the
+closed-form annuity balance, instead of stepping the balance month by month.
+
+For a fixed rate and term every column is proportional to the loan amount, so
+single-loan schedules are built by scaling a cached unit-principal schedule.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from mortgage_engine.annuity import balance_factor, monthly_rate, payment_factor
+
+# Rows per chunk when schedules are streamed to a writer; the same as the
+# default Parquet row group, since every chunk becomes at least one group.
+SCHEDULE_CHUNK_ROWS = 2**20
+# Loans per chunk when many loans are scheduled, priced or stored a group at
+# a time.
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class AnnualSummary:
+    """Per-year totals of a schedule, one entry per (possibly partial) year."""
+
+    year: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+    cumulative_interest: np.ndarray
+    cumulative_principal: np.ndarray
+
+    def __len__(self):
+        return len(self.year)
+
+    def columns(self):
+        return {
+            "Year": self.year,
+            "Interest": self.interest,
+            "Principal": self.principal,
+            "Ending Balance": self.balance,
+            "Cumulative Interest": self.cumulative_interest,
+            "Cumulative Principal": self.cumulative_principal,
+        }
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """Columnar amortization schedule for a single loan.
+
+    `payment` is the constant monthly payment; every other field is an array
+    with one entry per month.
+    """
+
+    month: np.ndarray
+    payment: float
+    principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+
+    def __len__(self):
+        return len(self.month)
+
+    @property
+    def year(self):
+        return (self.month - 1) // 12 + 1
+
+    @cached_property
+    def annual(self):
+        """Yearly interest, principal and ending balance, built in one pass."""
+        starts = np.arange(0, len(self), 12)
+        ends = np.minimum(starts + 12, len(self)) - 1
+        interest = np.add.reduceat(self.interest, starts)
+        principal = np.add.reduceat(self.principal, starts)
+        return AnnualSummary(
+            year=np.arange(1, len(starts) + 1),
+            interest=interest,
+            principal=principal,
+            balance=self.balance[ends],
+            cumulative_interest=np.cumsum(interest),
+            cumulative_principal=np.cumsum(principal),
+        )
+
+    def slice(self, start, stop):
+        """Rows `start` to `stop` (0-based, exclusive) as a Schedule of views."""
+        return Schedule(
+            month=self.month[start:stop],
+            payment=self.payment,
+            principal=self.principal[start:stop],
+            interest=self.interest[start:stop],
+            balance=self.balance[start:stop],
+        )
+
+    def scaled(self, factor):
+        """Return this schedule with every amount multiplied by `factor`."""
+        return Schedule(
+            month=self.month,
+            payment=self.payment * factor,
+            principal=self.principal * factor,
+            interest=self.interest * factor,
+            balance=self.balance * factor,
+        )
+
+    def columns(self, names=None):
+        """Return the schedule as a dict of equal-length arrays.
+
+        `names` optionally selects and relabels columns as a sequence of
+        (column, label) pairs, e.g. (("Month", "Payment"), ...).
+        """
+        columns = {
+            "Month": self.month,
+            "Payment": np.full(len(self), self.payment),
+            "Principal": self.principal,
+            "Interest": self.interest,
+            "Remaining Balance": self.balance,
+            "Year": self.year,
+        }
+        if names is None:
+            return columns
+        return {label: columns[column] for column, label in names}
+
+    def iter_columns(self, chunk_rows=SCHEDULE_CHUNK_ROWS, names=None):
+        """Yield `columns(names)` for consecutive blocks of `chunk_rows` rows.
+
+        The blocks are views of the schedule, so writers can consume a long
+        schedule without ever holding a second full copy of it.
+        """
+        for start in range(0, len(self), chunk_rows):
+            yield self.slice(start, start + chunk_rows).columns(names)
+
+    def compact_columns(self, names=None, money=None):
+        """Like `columns`, but sized for display.
+
+        Month and Year are int16 and there is no Payment column, since the
+        payment is the same every month (read `payment` instead). `money`
+        optionally converts the amounts to "float32" or to int64 "cents".
+        """
+        columns = {
+            "Month": self.month.astype(np.int16),
+            "Principal": as_money(self.principal, money),
+            "Interest": as_money(self.interest, money),
+            "Remaining Balance": as_money(self.balance, money),
+            "Year": self.year.astype(np.int16),
+        }
+        if names is None:
+            return columns
+        return {label: columns[column] for column, label in names if column in columns}
+
+
+MONEY_DTYPES = ("float32", "cents")
+
+
+def as_money(values, money=None):
+    """Convert dollar amounts to a compact `money` representation (see MONEY_DTYPES)."""
+    if money is None:
+        return values
+    if money == "float32":
+        return np.asarray(values, dtype=np.float32)
+    if money == "cents":
+        return np.rint(np.multiply(values, 100)).astype(np.int64)
+    raise ValueError(f"Unknown money representation {money!r}; expected one of {MONEY_DTYPES}")
+
+
+# Rates are rounded before they are used as cache keys so that float noise
+# from the input widgets (4.5 vs 4.500000000000001) still hits the cache.
+RATE_KEY_DECIMALS = 8
+SCHEDULE_CACHE_SIZE = 256
+
+
+def normalize_rate(interest_rate):
+    return round(float(interest_rate), RATE_KEY_DECIMALS)
+
+
+def schedule_key(loan_amount, interest_rate, loan_term):
+    """Hashable, noise-free key for a loan: (amount in cents, rate, years)."""
+    return round(float(loan_amount), 2), normalize_rate(interest_rate), int(loan_term)
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def _unit_schedule(interest_rate, loan_term):
+    rate = monthly_rate(interest_rate)
+    total_payments = loan_term * 12
+    month = np.arange(1, total_payments + 1)
+
+    payment = float(payment_factor(rate, total_payments))
+    # Balance before each payment is the balance after the previous one.
+    balance = balance_factor(rate, total_payments, np.arange(total_payments + 1))
+    # The closed form lands on 0 up to float noise; never show a negative balance.
+    np.maximum(balance, 0, out=balance)
+    interest = balance[:-1] * rate
+    principal = payment - interest
+    balance = balance[1:]
+
+    # Cached arrays are shared between callers, so guard them against writes.
+    for column in (month, interest, principal, balance):
+        column.flags.writeable = False
+
+    return Schedule(
+        month=month,
+        payment=payment,
+        principal=principal,
+        interest=interest,
+        balance=balance,
+    )
+
+
+def amortization_schedule(loan_amount, interest_rate, loan_term):
+    """Build the full schedule for a loan.
+
+    `interest_rate` is the annual rate in percent and `loan_term` is in years.
+    """
+    unit = _unit_schedule(normalize_rate(interest_rate), int(loan_term))
+    return unit.scaled(loan_amount)
+
+
+def schedule_cache_info():
+    """Hits, misses and size of the unit-principal schedule cache."""
+    return _unit_schedule.cache_info()
+
+
+def clear_schedule_cache():
+    _unit_schedule.cache_clear()
+
+
+@dataclass(frozen=True)
+class BatchSchedule:
+    """Schedules for many loans as loans x months matrices.
+
+    Loans shorter than the longest term are padded with zeros; `mask` is True
+    for the months that belong to each loan's term.
+    """
+
+    month: np.ndarray
+    payment: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+    mask: np.ndarray
+
+    def __len__(self):
+        return len(self.payment)
+
+    @property
+    def term_months(self):
+        return self.mask.sum(axis=1)
+
+    def columns(self, loan_ids=None):
+        """Return the schedules in long format, one row per loan and month.
+
+        Padding months are dropped; `loan_ids` labels the rows of each loan
+        and defaults to the loan's position in the batch.
+        """
+        if loan_ids is None:
+            loan_ids = np.arange(len(self))
+        return {
+            "loan_id": np.repeat(np.asarray(loan_ids), self.term_months),
+            "Month": np.broadcast_to(self.month, self.mask.shape)[self.mask],
+            "Payment": np.broadcast_to(self.payment[:, None], self.mask.shape)[self.mask],
+            "Principal": self.principal[self.mask],
+            "Interest": self.interest[self.mask],
+            "Remaining Balance": self.balance[self.mask],
+        }
+
+    def loan(self, index):
+        """Return the schedule of a single loan, trimmed to its own term."""
+        n = int(self.mask[index].sum())
+        return Schedule(
+            month=self.month[:n],
+            payment=float(self.payment[index]),
+            principal=self.principal[index, :n],
+            interest=self.interest[index, :n],
+            balance=self.balance[index, :n],
+        )
+
+
+def normalize_loans(loan_amounts, interest_rates, loan_terms):
+    """Broadcast loan inputs to equal-length float64 amounts and rates and int64 terms."""
+    return np.broadcast_arrays(
+        np.asarray(loan_amounts, dtype=np.float64),
+        np.asarray(interest_rates, dtype=np.float64),
+        np.asarray(loan_terms).astype(np.int64),
+    )
+
+
+def batch_schedule(loan_amounts, interest_rates, loan_terms):
+    """Build schedules for many loans at once by broadcasting.
+
+    Each argument is a 1-D array (or scalar, broadcast against the others)
+    with amounts, annual rates in percent and terms in years.
+    """
+    loan_amounts, interest_rates, loan_terms = normalize_loans(loan_amounts, interest_rates, loan_terms)
+    rate = monthly_rate(interest_rates)
+    total_payments = loan_terms * 12
+    max_payments = int(total_payments.max(initial=0))
+    month = np.arange(1, max_payments + 1)
+
+    payment = loan_amounts * payment_factor(rate, total_payments)
+    balance = loan_amounts[:, None] * balance_factor(
+        rate[:, None], total_payments[:, None], np.arange(max_payments + 1)
+    )
+    np.maximum(balance, 0, out=balance)
+
+    mask = month <= total_payments[:, None]
+    interest = np.where(mask, balance[:, :-1] * rate[:, None], 0.0)
+    principal = np.where(mask, payment[:, None] - interest, 0.0)
+    balance = np.where(mask, balance[:, 1:], 0.0)
+
+    return BatchSchedule(
+        month=month,
+        payment=payment,
+        principal=principal,
+        interest=interest,
+        balance=balance,
+        mask=mask,
+    )
+
+
+def iter_batch_columns(loan_amounts, interest_rates, loan_terms, loan_ids=None, chunk_rows=SCHEDULE_CHUNK_ROWS):
+    """Yield long-format schedules for many loans, at most `chunk_rows` rows at a time.
+
+    Arguments are as for `batch_schedule`. Loans are scheduled a group at a
+    time, so only one group's loans x months matrices exist at once; a
+    single loan longer than `chunk_rows` months is still one chunk.
+    """
+    loan_amounts, interest_rates, loan_terms = normalize_loans(loan_amounts, interest_rates, loan_terms)
+    if loan_ids is None:
+        loan_ids = np.arange(len(loan_amounts))
+    max_payments = int(loan_terms.max(initial=0)) * 12
+    loans_per_chunk = max(1, chunk_rows // max(max_payments, 1))
+    for start in range(0, len(loan_amounts), loans_per_chunk):
+        group = slice(start, start + loans_per_chunk)
+        schedules = batch_schedule(loan_amounts[group], interest_rates[group], loan_terms[group])
+        yield schedules.columns(loan_ids[group])
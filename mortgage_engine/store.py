@@ -0,0 +1,92 @@
+"""On-disk schedule store for portfolios too large to hold in memory.
+
+A store is a directory of `.npy` files: one loans x months matrix per schedule
+column plus small per-loan arrays with the loan inputs. The matrices are
+written chunk by chunk through `np.memmap` and read back memory-mapped, so a
+single loan or a single month across all loans can be read without loading
+the rest of the file.
+"""
+
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from mortgage_engine.schedule import DEFAULT_CHUNK_SIZE, Schedule, batch_schedule, normalize_loans
+
+STORE_COLUMNS = ("principal", "interest", "balance")
+# Small per-loan arrays stored next to the matrices.
+LOAN_ARRAYS = ("loan_amount", "interest_rate", "loan_term", "payment")
+
+
+def write_store(path, loan_amounts, interest_rates, loan_terms, loan_ids=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Compute every loan's schedule straight into memory-mapped files at `path`.
+
+    Only `chunk_size` loans are held in memory at a time.
+    """
+    loan_amounts, interest_rates, loan_terms = normalize_loans(loan_amounts, interest_rates, loan_terms)
+    loan_count = len(loan_amounts)
+    months = int(loan_terms.max(initial=0)) * 12
+    os.makedirs(path, exist_ok=True)
+
+    matrices = {
+        column: open_memmap(os.path.join(path, f"{column}.npy"), mode="w+", dtype=np.float64, shape=(loan_count, months))
+        for column in STORE_COLUMNS
+    }
+    payment = np.empty(loan_count)
+    for start in range(0, loan_count, chunk_size):
+        stop = min(start + chunk_size, loan_count)
+        schedules = batch_schedule(loan_amounts[start:stop], interest_rates[start:stop], loan_terms[start:stop])
+        width = schedules.balance.shape[1]
+        for column, matrix in matrices.items():
+            # Months past a chunk's longest term keep the file's zero fill.
+            matrix[start:stop, :width] = getattr(schedules, column)
+        payment[start:stop] = schedules.payment
+    for matrix in matrices.values():
+        matrix.flush()
+    del matrices
+
+    for column, values in zip(LOAN_ARRAYS, (loan_amounts, interest_rates, loan_terms, payment)):
+        np.save(os.path.join(path, f"{column}.npy"), values)
+    if loan_ids is not None:
+        loan_ids = np.asarray(loan_ids)
+        if loan_ids.dtype.kind not in "iu":
+            # Fixed-width strings load without pickle, unlike object arrays.
+            loan_ids = loan_ids.astype(str)
+        np.save(os.path.join(path, "loan_id.npy"), loan_ids)
+    return ScheduleStore(path)
+
+
+class ScheduleStore:
+    """Read-only, memory-mapped view of a store written by `write_store`."""
+
+    def __init__(self, path):
+        self.path = path
+        for column in LOAN_ARRAYS:
+            setattr(self, column, np.load(os.path.join(path, f"{column}.npy")))
+        loan_id_path = os.path.join(path, "loan_id.npy")
+        self.loan_id = np.load(loan_id_path) if os.path.exists(loan_id_path) else np.arange(len(self.payment))
+        self.matrices = {
+            column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")
+            for column in STORE_COLUMNS
+        }
+
+    def __len__(self):
+        return len(self.payment)
+
+    @property
+    def months(self):
+        return self.matrices["balance"].shape[1]
+
+    def loan(self, index):
+        """Schedule of the loan at position `index`, trimmed to its term."""
+        n = int(self.loan_term[index]) * 12
+        return Schedule(
+            month=np.arange(1, n + 1),
+            payment=float(self.payment[index]),
+            **{column: np.array(matrix[index, :n]) for column, matrix in self.matrices.items()},
+        )
+
+    def month(self, month):
+        """Principal, interest and balance of every loan for the 1-based `month`."""
+        return {column: np.array(matrix[:, month - 1]) for column, matrix in self.matrices.items()}
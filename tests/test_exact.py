@@ -0,0 +1,52 @@
+"""The vectorized exact engine must match the month-by-month lender loop."""
+
+import numpy as np
+import pytest
+
+from mortgage_engine.exact import exact_schedule, sequential_exact_schedule
+
+COLUMNS = ("month", "payment", "principal", "interest", "balance")
+
+
+def assert_same_schedule(loan_amount, interest_rate, loan_term):
+    schedule = exact_schedule(loan_amount, interest_rate, loan_term)
+    reference = sequential_exact_schedule(loan_amount, interest_rate, loan_term)
+    assert len(schedule) == len(reference)
+    for column in COLUMNS:
+        np.testing.assert_array_equal(getattr(schedule, column), getattr(reference, column), err_msg=column)
+    return schedule
+
+
+def random_loans(count, seed=0):
+    rng = np.random.default_rng(seed)
+    amounts = rng.uniform(1_000, 2_000_000, count).round(2)
+    rates = rng.uniform(0, 20, count).round(3)
+    terms = rng.integers(1, 41, count)
+    return list(zip(amounts.tolist(), rates.tolist(), terms.tolist()))
+
+
+@pytest.mark.parametrize("loan", random_loans(300))
+def test_matches_sequential_loop(loan):
+    schedule = assert_same_schedule(*loan)
+    assert schedule.balance[-1] == 0
+    assert schedule.principal.sum() == round(loan[0] * 100)
+
+
+@pytest.mark.parametrize("loan", [(300_000, 0, 30), (1_234_567.89, 0, 40), (3.6, 0, 1)])
+def test_zero_rate(loan):
+    schedule = assert_same_schedule(*loan)
+    assert not schedule.interest.any()
+
+
+@pytest.mark.parametrize("loan", [(2, 0, 30), (7, 0, 30), (2, 0.5, 30)])
+def test_tiny_loans_pay_off_early(loan):
+    schedule = assert_same_schedule(*loan)
+    assert len(schedule) < loan[2] * 12
+    assert schedule.balance[-1] == 0
+
+
+@pytest.mark.parametrize("loan_amount", [1, 5, 300_000, 8_246_576.62])
+def test_high_rate_long_term(loan_amount):
+    schedule = assert_same_schedule(loan_amount, 20, 40)
+    assert len(schedule) == 480
+    assert schedule.balance[-1] == 0
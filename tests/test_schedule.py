@@ -0,0 +1,70 @@
+"""The vectorized float engine against the app's original month-by-month loop."""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from mortgage_engine import amortization_schedule, batch_schedule
+
+LOANS = [(300_000, 4.5, 30), (250_000, 6.875, 15), (1_000_000, 12.0, 40), (50_000, 0.25, 1), (400_000, 20.0, 40)]
+
+
+def original_schedule(loan_amount, interest_rate, loan_term):
+    """The loop the app used before the engine, returning (payment, principal, interest, balance)."""
+    monthly_rate = interest_rate / 100 / 12
+    total_payments = loan_term * 12
+    growth = (1 + monthly_rate) ** total_payments
+    monthly_payment = loan_amount * (monthly_rate * growth) / (growth - 1)
+
+    principal, interest, balance = [], [], []
+    remaining_balance = loan_amount
+    for _ in range(total_payments):
+        interest_payment = remaining_balance * monthly_rate
+        principal_payment = monthly_payment - interest_payment
+        remaining_balance = max(remaining_balance - principal_payment, 0)
+        principal.append(principal_payment)
+        interest.append(interest_payment)
+        balance.append(remaining_balance)
+    return monthly_payment, np.array(principal), np.array(interest), np.array(balance)
+
+
+def assert_matches_original(schedule, loan):
+    payment, principal, interest, balance = original_schedule(*loan)
+    # The loop accumulates float error month by month; stay well under a cent.
+    tolerance = {"rtol": 1e-9, "atol": 1e-6}
+    assert len(schedule) == loan[2] * 12
+    np.testing.assert_allclose(schedule.payment, payment, **tolerance)
+    np.testing.assert_allclose(schedule.principal, principal, **tolerance)
+    np.testing.assert_allclose(schedule.interest, interest, **tolerance)
+    np.testing.assert_allclose(schedule.balance, balance, **tolerance)
+
+
+@pytest.mark.parametrize("loan", LOANS)
+def test_amortization_schedule_matches_original(loan):
+    assert_matches_original(amortization_schedule(*loan), loan)
+
+
+def test_batch_schedule_matches_original():
+    amounts, rates, terms = zip(*LOANS)
+    schedules = batch_schedule(amounts, rates, terms)
+    for index, loan in enumerate(LOANS):
+        assert_matches_original(schedules.loan(index), loan)
+    # Months past a loan's own term are zero padding.
+    assert not schedules.balance[~schedules.mask].any()
+
+
+def test_zero_rate_repays_evenly():
+    schedule = amortization_schedule(120_000, 0, 10)
+    np.testing.assert_allclose(schedule.principal, 1_000)
+    assert not schedule.interest.any()
+    assert schedule.balance[-1] == 0
+
+
+def test_long_zero_rate_term_has_no_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        schedule = amortization_schedule(300_000, 0, 1_000)
+        schedules = batch_schedule([300_000, 300_000], [0, 5], [1_000, 30])
+    assert schedule.balance[-1] == 0
+    assert not schedules.balance[:, -1].any()
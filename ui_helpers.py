@@ -0,0 +1,347 @@
+import dataclasses
+import functools
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from mortgage_engine import TTLCache, amortization_schedule, schedule_cache_info, schedule_key
+from mortgage_engine.exact import exact_schedule
+from mortgage_engine.scenarios import ScenarioGrid
+from mortgage_engine.schedule import normalize_rate
+from mortgage_engine.store import ScheduleStore
+
+# Schedules are shared by every session on this server, so most reruns with
+# the default inputs are served without touching the engine at all.
+SCHEDULE_CACHE_ENTRIES = 512
+SCHEDULE_CACHE_TTL = 60 * 60
+
+
+def record_timing(name, seconds):
+    """Count a run of the unit `name` and remember how long it took."""
+    timings = st.session_state.setdefault("unit_timings", {})
+    runs, _ = timings.get(name, (0, 0.0))
+    timings[name] = (runs + 1, seconds)
+
+
+def timed_fragment(name):
+    """Turn a function into an st.fragment whose runs are timed under `name`.
+
+    Widgets inside the fragment rerun only the fragment. The timings show up
+    in the debug expander rendered by `render_timing_debug`, which a
+    fragment-only rerun redraws itself since the rest of the script is skipped.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_timing(name, time.perf_counter() - started)
+                ctx = get_script_run_ctx()
+                readout = st.session_state.get("timing_readout")
+                if readout is not None and ctx is not None and ctx.fragment_ids_this_run:
+                    _draw_timings(readout)
+
+        return st.fragment(timed)
+
+    return decorator
+
+
+def _draw_timings(readout):
+    timings = st.session_state.get("unit_timings", {})
+    with readout.container():
+        st.dataframe(
+            pd.DataFrame(
+                [(name, runs, seconds * 1000) for name, (runs, seconds) in timings.items()],
+                columns=["Unit", "Runs", "Last run (ms)"]
+            ),
+            hide_index=True,
+            column_config={"Last run (ms)": st.column_config.NumberColumn(format="%.1f")}
+        )
+        st.write(f"Reruns avoided by apply mode: {st.session_state.get('reruns_avoided', 0)}")
+
+
+def render_timing_debug(container=st.sidebar):
+    """Runs and last duration of the script and of each timed fragment."""
+    with container.expander("Debug: rerun timings"):
+        readout = st.empty()
+    st.session_state["timing_readout"] = readout
+    _draw_timings(readout)
+
+
+def input_group(key, apply_mode, container=st):
+    """Container for a group of inputs.
+
+    In apply mode the inputs sit in an st.form, so editing them does not
+    rerun anything until the form's Apply button is pressed.
+    """
+    if apply_mode:
+        return container.form(key, border=False)
+    return container.container()
+
+
+def apply_inputs(group, key, apply_mode, values):
+    """Add the Apply button to an `input_group` and count the reruns it saved.
+
+    Without the form every changed input would have rerun the script once, so
+    a submission that changes n inputs saves n - 1 reruns.
+    """
+    submitted = group.form_submit_button("Apply", type="primary") if apply_mode else False
+    applied_key = f"{key}-applied"
+    previous = st.session_state.get(applied_key)
+    if submitted and previous is not None:
+        changed = sum(value != old for value, old in zip(values, previous))
+        st.session_state["reruns_avoided"] = st.session_state.get("reruns_avoided", 0) + max(changed - 1, 0)
+    st.session_state[applied_key] = values
+
+
+@st.cache_resource
+def schedule_cache():
+    return TTLCache(maxsize=SCHEDULE_CACHE_ENTRIES, ttl=SCHEDULE_CACHE_TTL)
+
+
+def _read_only(schedule):
+    # Cached schedules are handed to every session, so guard their arrays
+    # against writes, as the engine does for its unit schedules.
+    for field in dataclasses.fields(schedule):
+        value = getattr(schedule, field.name)
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return schedule
+
+
+def cached_schedule(loan_amount, interest_rate, loan_term):
+    key = schedule_key(loan_amount, interest_rate, loan_term)
+    return schedule_cache().get_or_compute(key, lambda: _read_only(amortization_schedule(*key)))
+
+
+def cached_exact_schedule(loan_amount, interest_rate, loan_term):
+    key = schedule_key(loan_amount, interest_rate, loan_term)
+    return schedule_cache().get_or_compute(("exact",) + key, lambda: _read_only(exact_schedule(*key)))
+
+
+def render_cache_debug(container=st.sidebar):
+    """Show schedule cache size and hit ratio in a collapsed debug expander."""
+    cache = schedule_cache()
+    unit_info = schedule_cache_info()
+    with container.expander("Debug: schedule cache"):
+        st.write(f"Shared schedules: {len(cache)} / {cache.maxsize} (TTL {cache.ttl}s)")
+        st.write(f"Hit ratio: {cache.hit_ratio:.1%} ({cache.hits} hits, {cache.misses} misses)")
+        st.write(
+            f"Unit schedules: {unit_info.currsize} / {unit_info.maxsize} "
+            f"({unit_info.hits} hits, {unit_info.misses} misses)"
+        )
+
+
+MONEY_COLUMNS = ("Payment", "Principal", "Interest", "Remaining Balance")
+
+
+@functools.cache
+def currency_column_config(columns):
+    """Dollar formatting for `columns`, built once per set of column labels.
+
+    The browser formats the raw numbers, so unlike a pandas Styler no
+    formatted copy of the table is rendered or sent.
+    """
+    currency = st.column_config.NumberColumn(format="$%.2f")
+    return {column: currency for column in columns}
+
+
+def schedule_frame(schedule, column_names=None, compact=False, money=None):
+    """DataFrame of a schedule's columns.
+
+    With `compact`, months and years are int16 and the constant payment is
+    kept once in `frame.attrs["payment"]` instead of on every row; `money`
+    is passed on to Schedule.compact_columns.
+    """
+    if not compact:
+        return pd.DataFrame(schedule.columns(column_names))
+    frame = pd.DataFrame(schedule.compact_columns(column_names, money))
+    frame.attrs["payment"] = schedule.payment
+    return frame
+
+
+def render_schedule_page(schedule, column_names=None, key="schedule-year", compact=False):
+    """Show one year of the schedule at a time, with a control to jump to any year.
+
+    Only the visible rows are sliced out of the engine's arrays and sent to
+    the browser, so the payload is the same for a 1-year and a 40-year loan.
+    With `compact`, the payment is shown once as a caption instead of a column.
+    """
+    years = (len(schedule) + 11) // 12
+    year = st.number_input("Jump to year", min_value=1, max_value=years, value=1, step=1, key=key)
+    frame = schedule_frame(schedule.slice((year - 1) * 12, year * 12), column_names, compact)
+
+    if compact:
+        st.caption(f"Monthly payment: ${frame.attrs['payment']:,.2f}")
+    labels = dict(column_names) if column_names is not None else {name: name for name in MONEY_COLUMNS}
+    st.dataframe(
+        frame,
+        hide_index=True,
+        column_config=currency_column_config(tuple(labels[name] for name in MONEY_COLUMNS if name in labels))
+    )
+
+
+def render_loan_schedule(loan_amount, interest_rate, loan_term, column_names=None):
+    """Paged schedule for a loan, optionally in exact lender-rounded cents.
+
+    Returns whether the exact schedule is shown, so a download next to the
+    table can export the same figures.
+    """
+    exact = st.toggle(
+        "Round to the cent like a lender",
+        key="exact-cents",
+        help="Round each month's interest to the cent and adjust the final payment so the balance ends at exactly $0"
+    )
+    if not exact:
+        render_schedule_page(cached_schedule(loan_amount, interest_rate, loan_term), column_names)
+        return False
+
+    schedule = cached_exact_schedule(loan_amount, interest_rate, loan_term)
+    st.caption(f"Final payment: ${schedule.final_payment / 100:,.2f}, leaving a balance of exactly $0.00")
+    render_schedule_page(schedule, column_names)
+    return True
+
+
+@st.cache_data(max_entries=SCHEDULE_CACHE_ENTRIES, ttl=SCHEDULE_CACHE_TTL, show_spinner=False)
+def schedule_export(loan_amount, interest_rate, loan_term, column_names, format_name, exact=False):
+    from mortgage_engine.export import export_bytes
+
+    if exact:
+        schedule = cached_exact_schedule(loan_amount, interest_rate, loan_term)
+        return export_bytes(schedule.columns(column_names), format_name)
+    schedule = cached_schedule(loan_amount, interest_rate, loan_term)
+    return export_bytes(schedule.iter_columns(names=column_names), format_name)
+
+
+@timed_fragment("Download")
+def schedule_download_button(loan_amount, interest_rate, loan_term, column_names=None, exact=False):
+    """Format picker plus a download button that encodes only on click.
+
+    The bytes are cached on the scenario inputs rather than on the DataFrame
+    contents, so reruns never hash or encode the schedule. With `exact`, the
+    lender-rounded schedule from `render_loan_schedule` is exported.
+    """
+    # pyarrow is only needed once a download section is shown
+    from mortgage_engine.export import EXPORT_FORMATS
+
+    key = schedule_key(loan_amount, interest_rate, loan_term)
+    column_names = tuple(column_names) if column_names is not None else None
+    format_name = st.selectbox("Download format", list(EXPORT_FORMATS), key='download-format')
+    export_format = EXPORT_FORMATS[format_name]
+    st.download_button(
+        "Download Full Amortization Schedule",
+        lambda: schedule_export(*key, column_names, format_name, exact),
+        f"mortgage_amortization.{export_format.extension}",
+        export_format.mime,
+        key='download-schedule',
+        on_click="ignore"
+    )
+
+
+# The store browser only lists stores in the directory named by this variable
+# and is hidden when it is unset, so visitors cannot open arbitrary paths.
+STORE_ROOT_ENV = "MORTGAGE_STORE_ROOT"
+STORE_CACHE_ENTRIES = 8
+
+
+@st.cache_resource(max_entries=STORE_CACHE_ENTRIES)
+def open_schedule_store(path):
+    return ScheduleStore(path)
+
+
+def list_schedule_stores(root):
+    """Names of the store directories directly under `root`."""
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return []
+    return [name for name in names if os.path.isfile(os.path.join(root, name, "balance.npy"))]
+
+
+def render_store_browser():
+    """Browse single loans of an on-disk schedule store (see mortgage_engine.store).
+
+    Only the selected loan's rows are read from the memory-mapped files.
+    """
+    root = os.environ.get(STORE_ROOT_ENV)
+    if not root:
+        return
+    with st.sidebar.expander("Browse schedule store"):
+        name = st.selectbox(
+            "Store",
+            list_schedule_stores(root),
+            index=None,
+            placeholder="Choose a store",
+            key="store-name",
+            help="Created with `python -m mortgage_engine store`"
+        )
+    if name is None:
+        return
+
+    store = open_schedule_store(os.path.join(root, name))
+    if len(store) == 0:
+        st.sidebar.info(f"Store {name} has no loans")
+        return
+    st.header("Stored Schedule")
+    index = st.number_input("Loan number", min_value=0, max_value=len(store) - 1, value=0, step=1, key="store-loan")
+    schedule = store.loan(index)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Loan ID", f"{store.loan_id[index]}")
+    col2.metric("Loan Amount", f"${store.loan_amount[index]:,.2f}")
+    col3.metric("Interest Rate", f"{store.interest_rate[index]:.3f}%")
+    col4.metric("Monthly Payment", f"${schedule.payment:,.2f}")
+    render_schedule_page(schedule, key="store-year")
+
+
+@st.cache_resource(max_entries=SCHEDULE_CACHE_ENTRIES)
+def scenario_grid(interest_rate, loan_term):
+    return ScenarioGrid(interest_rate, loan_term)
+
+
+@timed_fragment("Explore")
+def render_explore_mode(loan_amount, interest_rate, loan_term):
+    """Sweep loan amount and rate around the sidebar inputs.
+
+    Answers come from a grid precomputed once per (rate, term), and the
+    section runs as a fragment, so dragging these sliders reruns nothing else.
+    """
+    interest_rate = normalize_rate(interest_rate)
+    grid = scenario_grid(interest_rate, int(loan_term))
+    # Keys include the grid centre so the sliders reset when the sidebar changes
+    scenario = f"{loan_amount}-{interest_rate}-{loan_term}"
+
+    col1, col2 = st.columns(2)
+    amount = col1.slider(
+        "Loan Amount ($)",
+        min_value=int(loan_amount // 2),
+        max_value=int(loan_amount * 3 // 2),
+        value=int(loan_amount),
+        step=1000,
+        key=f"explore-amount-{scenario}"
+    )
+    rate = col2.slider(
+        "Annual Interest Rate (%)",
+        min_value=grid.min_rate,
+        max_value=grid.max_rate,
+        value=interest_rate,
+        step=grid.step,
+        key=f"explore-rate-{scenario}"
+    )
+
+    started = time.perf_counter()
+    payment, total_interest, balance = grid.at(amount, rate)
+    elapsed = time.perf_counter() - started
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Monthly Payment", f"${payment:,.2f}")
+    col2.metric("Total Payment", f"${payment * loan_term * 12:,.2f}")
+    col3.metric("Total Interest", f"${total_interest:,.2f}")
+    st.line_chart(
+        pd.DataFrame({"Remaining Balance": balance}, index=pd.Index(grid.year_end_months // 12, name="Year"))
+    )
+    st.caption(f"Scenario answered in {elapsed * 1000:.2f} ms from the precomputed grid")
@@ -0,0 +1,89 @@
+import time
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from mortgage_engine.schedule import as_money
+from ui_helpers import (
+    apply_inputs,
+    cached_schedule,
+    input_group,
+    record_timing,
+    render_cache_debug,
+    render_loan_schedule,
+    render_timing_debug,
+    schedule_download_button,
+    timed_fragment
+)
+
+page_started = time.perf_counter()
+
+# Calculator sections. Each one is a fragment, so changing the calculator
+# inputs reruns only the calculator, and changing the download format reruns
+# only the download.
+@timed_fragment("Repayments")
+def render_repayments(loan_amount, interest_rate, loan_term):
+    # Calculate the repayments.
+    number_of_payments = loan_term * 12
+    monthly_payment = cached_schedule(loan_amount, interest_rate, loan_term).payment
+
+    # Display the repayments.
+    total_payments = monthly_payment * number_of_payments
+    total_interest = total_payments - loan_amount
+
+    st.write("### Repayments")
+    col1, col2, col3 = st.columns(3)
+    col1.metric(label="Monthly Repayments", value=f"${monthly_payment:,.2f}")
+    col2.metric(label="Total Repayments", value=f"${total_payments:,.0f}")
+    col3.metric(label="Total Interest", value=f"${total_interest:,.0f}")
+
+@timed_fragment("Chart")
+def render_payment_chart(loan_amount, interest_rate, loan_term):
+    # Display the yearly balances as a chart.
+    st.write("### Payment Schedule")
+    annual = cached_schedule(loan_amount, interest_rate, loan_term).annual
+    # Display-only data, so float32 balances and int16 years are precise enough
+    payments_df = pd.DataFrame(
+        {"Remaining Balance": as_money(annual.balance, "float32")},
+        index=pd.Index(annual.year.astype(np.int16), name="Year")
+    )
+    
+    # Improve the visualization
+    st.line_chart(payments_df)
+
+@timed_fragment("Table")
+def render_schedule_table(loan_amount, interest_rate, loan_term):
+    # Display the amortization table one year at a time
+    st.write("### Amortization Schedule")
+    exact = render_loan_schedule(loan_amount, interest_rate, loan_term)
+
+    # Download option for full schedule, following the exact-cents toggle
+    schedule_download_button(loan_amount, interest_rate, loan_term, exact=exact)
+
+@timed_fragment("Inputs")
+def mortgage_calculator():
+    st.write("### Input Data")
+    apply_mode = st.toggle(
+        "Apply changes with a button",
+        help="Edit several inputs and recalculate once, instead of after every change"
+    )
+    inputs = input_group("calculator-inputs", apply_mode)
+    col1, col2 = inputs.columns(2)
+    home_value = col1.number_input("Home Value", min_value=0, value=500000, key="home_value")
+    deposit = col1.number_input("Deposit", min_value=0, value=100000, key="deposit")
+    interest_rate = col2.number_input("Interest Rate (in %)", min_value=0.0, value=5.5, key="interest_rate")
+    loan_term = col2.number_input("Loan Term (in years)", min_value=1, value=30, key="loan_term")
+    apply_inputs(inputs, "calculator-inputs", apply_mode, (home_value, deposit, interest_rate, loan_term))
+    loan_amount = home_value - deposit
+
+    render_repayments(loan_amount, interest_rate, loan_term)
+    render_payment_chart(loan_amount, interest_rate, loan_term)
+    render_schedule_table(loan_amount, interest_rate, loan_term)
+
+st.title("Mortgage Repayments Calculator")
+mortgage_calculator()
+
+render_cache_debug()
+record_timing("Calculator page", time.perf_counter() - page_started)
+render_timing_debug()
@@ -0,0 +1,134 @@
+import streamlit as st
+
+# Initialize session state for chat history
+if "messages" not in st.session_state:
+    st.session_state.messages = []
+
+# Set OpenAI API key - use Streamlit secrets in production
+# For security, we're using a placeholder here
+# In Streamlit Cloud, you'll set this in the app's secrets management
+openai_api_key = st.sidebar.text_input("OpenAI API Key", 
+                                      type="password", 
+                                      placeholder="sk-...",
+                                      help="Enter your OpenAI API key here. It will not be stored.")
+
+# Disable the API key warning in sidebar when deploying
+if not openai_api_key:
+    st.sidebar.warning("Please enter your OpenAI API key to use the ChatGPT feature.")
+
+# Helper function for older Streamlit versions
+def legacy_chat_message(role, content):
+    if role == "user":
+        st.markdown(f"**You:** {content}")
+    else:  # assistant
+        st.markdown(f"**Assistant:** {content}")
+    st.markdown("---")
+
+# ChatGPT Page
+st.title("Chat with GPT")
+st.write("Have a conversation with ChatGPT. Ask any questions about mortgages or any other topic.")
+
+# Skip API calls if no key is provided
+if not openai_api_key:
+    st.info("Please enter your OpenAI API key in the sidebar to use this feature.")
+else:
+    # Display chat messages from history
+    has_chat_message = True
+    try:
+        # Test if chat_message exists
+        st.chat_message
+        for message in st.session_state.messages:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+    except AttributeError:
+        # Fallback for older Streamlit versions
+        has_chat_message = False
+        st.write("### Chat History")
+        for message in st.session_state.messages:
+            legacy_chat_message(message["role"], message["content"])
+    
+    # Accept user input - with fallback for older Streamlit versions
+    try:
+        prompt = st.chat_input("What would you like to know?")
+    except AttributeError:
+        # Fallback for older Streamlit versions that don't have chat_input
+        st.write("### Your message")
+        prompt = st.text_area("Type your message here:", key="user_input", height=100)
+        send_button = st.button("Send")
+        if send_button:
+            pass  # This will allow the prompt to be processed below
+        else:
+            prompt = None  # If button not clicked, don't process input
+            
+    if prompt:
+        # Add user message to chat history
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        
+        # Display user message in chat message container
+        if has_chat_message:
+            with st.chat_message("user"):
+                st.markdown(prompt)
+        
+        # Display assistant thinking indicator
+        if has_chat_message:
+            with st.chat_message("assistant"):
+                message_placeholder = st.empty()
+                message_placeholder.markdown("Thinking...")
+        else:
+            st.write("**Assistant is thinking...**")
+            message_placeholder = st.empty()
+            message_placeholder.markdown("Thinking...")
+            
+        try:
+            # Import the OpenAI client only when a message is sent, so the
+            # calculator page never pays for it
+            import openai
+            
+            # Initialize OpenAI client with the provided API key
+            client = openai.OpenAI(api_key=openai_api_key)
+            
+            # Call OpenAI API
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": m["role"], "content": m["content"]}
+                    for m in st.session_state.messages
+                ],
+                stream=True
+            )
+            
+            # Stream the response
+            full_response = ""
+            for chunk in response:
+                if chunk.choices[0].delta.content is not None:
+                    full_response += chunk.choices[0].delta.content
+                message_placeholder.markdown(full_response + "▌")
+            
+            # Final response without cursor
+            message_placeholder.markdown(full_response)
+            
+            # Add assistant response to chat history
+            st.session_state.messages.append({"role": "assistant", "content": full_response})
+            
+            # If using legacy display, show the new message
+            if not has_chat_message:
+                st.write("**New response:**")
+                legacy_chat_message("assistant", full_response)
+        
+        except Exception as e:
+            error_message = f"Error: {str(e)}"
+            message_placeholder.markdown(error_message)
+            st.error(f"An error occurred: {str(e)}")
+            
+            # Add error message to chat history instead of undefined full_response
+            st.session_state.messages.append({"role": "assistant", "content": error_message})
+
+    # Add a button to clear chat history
+    if st.button("Clear Conversation"):
+        st.session_state.messages = []
+        # Use the appropriate rerun method based on Streamlit version
+        try:
+            st.rerun()
+        except AttributeError:
+            # Fallback for older Streamlit versions
+            st.experimental_rerun()